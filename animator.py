@@ -1,13 +1,13 @@
 """Methods and constants for creating animations"""
 
 # Standard Library
-from typing import List
+import os
+from typing import Callable, Iterable, List, Optional
 from random import choice, sample
 
 # Third party
-import gif
 import numpy as np
-import plotly.graph_objects as go
+from PIL import Image
 
 
 # TODO: add more colors
@@ -18,27 +18,53 @@ COLORS = [("#155b92", "#15925e"),
           ("#ff928b", "#b392ac"),
           ("#00d59e", "#ab63fa")]
 
+# Constants
+CELL_SIZE = 10
+FRAME_DURATION = 75
 
-@gif.frame
-def animation_frame(fig: go.Figure) -> go.Figure:
-    return fig
 
+def make_palette(colors: List[str]) -> List[int]:
+    """Flattened RGB palette mapping dead cells to the first of `colors` and
+    living cells to the second"""
+    return [int(c[i:i+2], 16) for c in colors for i in (1, 3, 5)]
 
-def make_plot(state: np.ndarray, colors: List[str]) -> go.Figure:
-    height, width = state.shape
-    fig = go.Figure(go.Heatmap(z=state, colorscale=colors))
-    fig.update_traces(showscale=False)
-    fig.update_layout(width=10*width,
-                      height=10*height,
-                      xaxis_visible=False,
-                      yaxis_visible=False,
-                      margin=dict(t=0, b=0, l=0, r=0))
-    return fig
 
+def make_frame(state: np.ndarray, palette: List[int]) -> Image.Image:
+    """Renders a state directly as a paletted image, with each cell scaled
+    up to a `CELL_SIZE` square"""
+    cells = state.astype(np.uint8, copy=False)
+    pixels = cells.repeat(CELL_SIZE, axis=0).repeat(CELL_SIZE, axis=1)
+    frame = Image.fromarray(pixels)
+    frame.putpalette(palette)
+    return frame
 
-def make_animation(states: List[np.ndarray], filename: str):
+
+def make_animation(states: Iterable[np.ndarray], filename: str,
+                   tail: Optional[Callable[[], List[np.ndarray]]] = None,
+                   tail_frames: int = 0):
+    """Saves `states` as an animated gif named with its number of frames.
+    If given, `tail` is called once `states` is exhausted, and the cycle of
+    states it returns is looped for at least `tail_frames` more frames."""
     print("animating...")
-    colors = sample(choice(COLORS), k=2)
-    frames = [animation_frame(make_plot(s, colors)) for s in states]
-    filename += f"_{len(frames)}_frames.gif"
-    gif.save(frames, filename, duration=75)
+    palette = make_palette(sample(choice(COLORS), k=2))
+    num_frames = 0
+
+    def frames():
+        nonlocal num_frames
+        for num_frames, state in enumerate(states, 1):
+            yield make_frame(state, palette)
+        if tail is not None and (cycle := [make_frame(state, palette)
+                                           for state in tail()]):
+            for frame in cycle*-(-tail_frames // len(cycle)):
+                num_frames += 1
+                yield frame
+
+    frame_iter = frames()
+    next(frame_iter).save(f"{filename}.gif",
+                          save_all=True,
+                          append_images=frame_iter,
+                          duration=FRAME_DURATION,
+                          disposal=1,
+                          optimize=False,
+                          loop=0)
+    os.replace(f"{filename}.gif", f"{filename}_{num_frames}_frames.gif")
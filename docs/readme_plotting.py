@@ -57,10 +57,36 @@ REFS = {
 }
 
 
+WINDOW_DIMS = {"x0": -0.5, "y0": 2.5, "x1": 2.5, "y1": -0.5}
+WINDOW_CENTRAL_DIMS = {"x0": 0.5, "y0": 1.5, "x1": 1.5, "y1": 0.5}
+LINE_WIDTH = 6
+OPACITY = 0.2
+
+
+def make_rect(dims, color, filled=False, **refs):
+    rect = {"type": "rect",
+            **dims,
+            **refs,
+            "line_width": LINE_WIDTH,
+            "line_color": color}
+    if filled:
+        rect.update(fillcolor=color, opacity=OPACITY)
+    return rect
+
+
+# outlines of the board, cells and windows, which are the same in every frame
+BOARD_SHAPES = [
+    *(make_rect(WINDOW_DIMS, BOARD_COLOR, **REFS[i]) for i in range(9)),
+    make_rect({"x0": -0.5, "y0": 4.5, "x1": 4.5, "y1": -0.5}, BOARD_COLOR),
+    make_rect({"x0": 0.5, "y0": 3.5, "x1": 3.5, "y1": 0.5}, CELLS_COLOR)
+]
+
+
+ANNOTATIONS = np.array([""] + list("ABCDEFGHI"), dtype=object)
+
+
 def get_annotations(x):
-    n = len(x)
-    annotation_lookup = dict(zip(range(10), [""] + list("ABCDEFGHI")))
-    return [[annotation_lookup[x[j, i]] for i in range(n)] for j in range(n)]
+    return ANNOTATIONS[x].tolist()
 
 
 def update_annotations(fig, x, y):
@@ -86,8 +112,6 @@ def make_sliding_window_plot(big_fig, windows, *, dims, central_dims, refs):
                         vertical_spacing=0.015,
                         start_cell="bottom-left",
                         print_grid=False)
-    line_width = 6
-    opacity = 0.2
     annotations = []
     big_fig = update_annotations(big_fig, "x", "y")
     annotations.extend(big_fig.layout.annotations)
@@ -102,99 +126,16 @@ def make_sliding_window_plot(big_fig, windows, *, dims, central_dims, refs):
             annotations.extend(window_fig.layout.annotations)
             fig.add_trace(window_fig.data[0], row=row, col=col)
 
-    shapes = []
-    for i in range(9):
-        window_refs = REFS[i]
-        xref, yref = window_refs["xref"], window_refs["yref"]
-        shapes.append({"type": "rect",
-                       "x0": -0.5,
-                       "y0": 2.5,
-                       "x1": 2.5,
-                       "y1": -0.5,
-                       "xref": xref,
-                       "yref": yref,
-                       "line_width": line_width,
-                       "line_color": BOARD_COLOR})
-
-    # TODO: implement shape maker helper function
-    shapes += [{"type": "rect",
-                "x0": -0.5,
-                "y0": 4.5,
-                "x1": 4.5,
-                "y1": -0.5,
-                "line_width": line_width,
-                "line_color": BOARD_COLOR},
-               {"type": "rect",
-                "x0": 0.5,
-                "y0": 3.5,
-                "x1": 3.5,
-                "y1": 0.5,
-                "line_width": line_width,
-                "line_color": CELLS_COLOR},
-               {"type": "rect",
-                "xref": "x",
-                "yref": "y",
-                **dims,
-                "line_width": line_width,
-                "line_color": SELECT_3x3_COLOR,
-                "fillcolor": SELECT_3x3_COLOR,
-                "opacity": opacity},
-               {"type": "rect",
-                "xref": "x",
-                "yref": "y",
-                **central_dims,
-                "line_width": line_width,
-                "line_color": SELECT_1x1_COLOR,
-                "fillcolor": SELECT_1x1_COLOR,
-                "opacity": opacity},
-               {"type": "rect",
-                "xref": "x",
-                "yref": "y",
-                **dims,
-                "line_width": line_width,
-                "line_color": SELECT_3x3_COLOR},
-               {"type": "rect",
-                "xref": "x",
-                "yref": "y",
-                **central_dims,
-                "line_width": line_width,
-                "line_color": SELECT_1x1_COLOR},
-               {"type": "rect",
-                "x0": -0.5,
-                "y0": 2.5,
-                "x1": 2.5,
-                "y1": -0.5,
-                **refs,
-                "line_width": line_width,
-                "line_color": SELECT_3x3_COLOR,
-                "fillcolor": SELECT_3x3_COLOR,
-                "opacity": opacity},
-               {"type": "rect",
-                "x0": 0.5,
-                "y0": 1.5,
-                "x1": 1.5,
-                "y1": 0.5,
-                **refs,
-                "line_width": line_width,
-                "line_color": SELECT_1x1_COLOR,
-                "fillcolor": SELECT_1x1_COLOR,
-                "opacity": opacity},
-               {"type": "rect",
-                "x0": -0.5,
-                "y0": 2.5,
-                "x1": 2.5,
-                "y1": -0.5,
-                **refs,
-                "line_width": line_width,
-                "line_color": SELECT_3x3_COLOR},
-               {"type": "rect",
-                "x0": 0.5,
-                "y0": 1.5,
-                "x1": 1.5,
-                "y1": 0.5,
-                **refs,
-                "line_width": line_width,
-                "line_color": SELECT_1x1_COLOR}]
+    shapes = BOARD_SHAPES + [
+        make_rect(dims, SELECT_3x3_COLOR, True, xref="x", yref="y"),
+        make_rect(central_dims, SELECT_1x1_COLOR, True, xref="x", yref="y"),
+        make_rect(dims, SELECT_3x3_COLOR, xref="x", yref="y"),
+        make_rect(central_dims, SELECT_1x1_COLOR, xref="x", yref="y"),
+        make_rect(WINDOW_DIMS, SELECT_3x3_COLOR, True, **refs),
+        make_rect(WINDOW_CENTRAL_DIMS, SELECT_1x1_COLOR, True, **refs),
+        make_rect(WINDOW_DIMS, SELECT_3x3_COLOR, **refs),
+        make_rect(WINDOW_CENTRAL_DIMS, SELECT_1x1_COLOR, **refs)
+    ]
 
     fig.update_layout(height=500,
                       width=950,
@@ -218,8 +159,7 @@ def make_sliding_window_animation(cells, boundary="fixed"):
     if boundary == "fixed":
         game_board = np.pad(cells, 1)
     else:
-        n = len(cells) - 1
-        game_board = np.tile(cells, (3, 3))[n:-n, n:-n]
+        game_board = np.pad(cells, 1, mode="wrap")
 
     big_fig = make_heatmap(game_board)
     windows = sliding_window_view(game_board, (3, 3))
@@ -29,6 +29,11 @@ The `pattern_type` parameter must be a string with value 'noise' or 'tiles'.
 """
 
 
+BATCH_ERROR_MSG = """
+The `batch` parameter must be a positive integer.
+"""
+
+
 class LifeParamsError(Exception):
     """Base exception for Life object parameter errors"""
     def __init__(self, msg: str):
@@ -65,10 +70,20 @@ class PatternValueError(LifeParamsError):
         super().__init__(f"{msg}\n{PATTERN_ERROR_MSG}")
 
 
+class BatchTypeError(LifeParamsError):
+    def __init__(self, msg: str):
+        super().__init__(f"{msg}\n{BATCH_ERROR_MSG}")
+
+
+class BatchValueError(LifeParamsError):
+    def __init__(self, msg: str):
+        super().__init__(f"{msg}\n{BATCH_ERROR_MSG}")
+
+
 def validate_args(size: Any, bounds: Any, pattern_type: Any) -> None:
     """Ensure Life parameters are correct"""
-    if (t := type(size)) != int:
-        err = f"Invalid `size` type '{t.__name__}'."
+    if not isinstance(size, int) or isinstance(size, bool):
+        err = f"Invalid `size` type '{type(size).__name__}'."
         raise SizeTypeError(err)
     if size < 10:
         err = f"Invalid `size` value '{size}'."
@@ -76,16 +91,27 @@ def validate_args(size: Any, bounds: Any, pattern_type: Any) -> None:
     if size > 200:
         print(SIZE_WARNING_MSG.format(n=size))
 
-    if (t := type(bounds)) != str:
-        err = f"Invalid `bounds` of type '{t.__name__}'."
+    if not isinstance(bounds, str):
+        err = f"Invalid `bounds` of type '{type(bounds).__name__}'."
         raise BoundsTypeError(err)
     if bounds not in ("fixed", "periodic"):
         err = f"Invalid `bounds` value '{bounds}'."
         raise BoundsValueError(err)
 
-    if (t := type(pattern_type)) != str:
+    if not isinstance(pattern_type, str):
+        t = type(pattern_type)
         err = f"Invalid `pattern_type` of type '{t.__name__}'."
         raise PatternTypeError(err)
     if pattern_type not in ("tiles", "noise"):
         err = f"Invalid `pattern_type` value '{pattern_type}'."
         raise PatternValueError(err)
+
+
+def validate_batch(batch: Any) -> None:
+    """Ensure the number of boards in a LifeBatch is correct"""
+    if not isinstance(batch, int) or isinstance(batch, bool):
+        err = f"Invalid `batch` type '{type(batch).__name__}'."
+        raise BatchTypeError(err)
+    if batch < 1:
+        err = f"Invalid `batch` value '{batch}'."
+        raise BatchValueError(err)
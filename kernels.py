@@ -0,0 +1,164 @@
+"""Compiled kernels for advancing `Life` states
+
+Boards are bit-packed so that each row is stored as little-endian `uint64`
+words holding 64 cells apiece, and a generation is computed on whole words
+at a time with bitwise (SWAR) arithmetic.
+
+Numba is an optional dependency. When it is not installed `make_step` returns
+`None` and `Life` falls back to its NumPy implementation.
+
+CuPy is likewise optional, and is used by `step_device` to advance large
+boards which are kept in GPU memory. When it is not installed `cp` is `None`.
+"""
+
+# Standard Library
+import functools
+from typing import Callable, Optional
+
+# Third party
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit, prange = None, range
+
+try:
+    import cupy as cp
+except ImportError:
+    cp = None
+
+# Type aliases
+PackedState = np.ndarray
+
+# Constants
+WORD_BITS = 64
+SPECIALIZE_MIN_WIDTH = 5000
+ZERO, ONE, HIGH_BIT = np.uint64(0), np.uint64(1), np.uint64(WORD_BITS - 1)
+
+
+def pack(state: np.ndarray) -> PackedState:
+    """Packs a binary board into rows of `uint64` words, with column `j` of
+    the board stored in bit `j % 64` of word `j // 64`."""
+    height, width = state.shape
+    words = -(-width // WORD_BITS)
+    buffer = np.zeros((height, 8*words), dtype=np.uint8)
+    bits = np.packbits(state, axis=1, bitorder="little")
+    buffer[:, :bits.shape[1]] = bits
+    return buffer.view("<u8")
+
+
+def unpack(packed: PackedState, width: int) -> np.ndarray:
+    """Inverse of `pack`, returning a `uint8` board with `width` columns"""
+    return np.unpackbits(packed.view(np.uint8),
+                         axis=1,
+                         count=width,
+                         bitorder="little")
+
+
+def _add(b0, b1, b2, x):
+    """Adds the one-bit lanes of `x` into the three-bit lane counters
+    `(b0, b1, b2)`. Counts wrap modulo 8, which only conflates eight living
+    neighbors with zero, both of which mean death."""
+    carry = b0 & x
+    b0 ^= x
+    b2 ^= b1 & carry
+    b1 ^= carry
+    return b0, b1, b2
+
+
+def _row(packed, r, w, last, periodic):
+    """Returns word `w` of row `r` together with copies shifted by one cell
+    towards the west and the east, carrying bits across word boundaries and
+    around the board edges when `periodic` is set."""
+    words = packed.shape[1]
+    mid = packed[r, w]
+    if w > 0:
+        prev = packed[r, w - 1] >> HIGH_BIT
+    elif periodic:
+        prev = (packed[r, words - 1] >> last) & ONE
+    else:
+        prev = ZERO
+    if w < words - 1:
+        nxt = packed[r, w + 1] << HIGH_BIT
+    elif periodic:
+        nxt = (packed[r, 0] & ONE) << last
+    else:
+        nxt = ZERO
+    return (mid << ONE) | prev, mid, (mid >> ONE) | nxt
+
+
+def _step(packed: PackedState,
+          out: PackedState,
+          width: int,
+          periodic: bool) -> None:
+    """Writes the next generation of the packed board into `out`.
+
+    The eight neighbors of each cell are summed into three bit-planes with
+    half-adders, so that a single word operation advances 64 cells at once,
+    and the B3/S23 rule reduces to `b1 & ~b2 & (b0 | alive)`. Rows are
+    distributed across threads. Bits beyond `width` are kept clear so that
+    they never leak into the eastern neighbors of the last column."""
+    height, words = packed.shape
+    last = np.uint64((width - 1) % WORD_BITS)
+    mask = ~ZERO >> np.uint64(WORD_BITS*words - width)
+    for i in prange(height):
+        up, down = i - 1, i + 1
+        if periodic:
+            up, down = (up + height) % height, down % height
+        for w in range(words):
+            b0 = b1 = b2 = ZERO
+            for r in (up, down):
+                if 0 <= r < height:
+                    west, mid, east = _row(packed, r, w, last, periodic)
+                    b0, b1, b2 = _add(b0, b1, b2, west)
+                    b0, b1, b2 = _add(b0, b1, b2, mid)
+                    b0, b1, b2 = _add(b0, b1, b2, east)
+            west, alive, east = _row(packed, i, w, last, periodic)
+            b0, b1, b2 = _add(b0, b1, b2, west)
+            b0, b1, b2 = _add(b0, b1, b2, east)
+            out[i, w] = b1 & ~b2 & (b0 | alive)
+        out[i, words - 1] &= mask
+
+
+@functools.lru_cache(maxsize=None)
+def make_step(width: int, periodic: bool) -> Optional[Callable]:
+    """Returns a compiled `step(packed, out)` kernel for boards of the given
+    `width` and boundary type, or `None` without Numba.
+
+    Boards narrower than `SPECIALIZE_MIN_WIDTH` share the generic `step`
+    kernel, which is cached to disk. Wider boards get a kernel closing over
+    `width` and `periodic`, which Numba treats as compile-time constants so
+    that the word mask and the `periodic` branches are folded away. Closures
+    cannot be cached to disk, so these are compiled once per process."""
+    if njit is None:
+        return None
+    if width < SPECIALIZE_MIN_WIDTH:
+        def generic(packed: PackedState, out: PackedState) -> None:
+            step(packed, out, width, periodic)
+        return generic
+
+    def specialized(packed: PackedState, out: PackedState) -> None:
+        _inline_step(packed, out, width, periodic)
+
+    return njit(parallel=True, boundscheck=False)(specialized)
+
+
+if njit is not None:
+    _add = njit(inline="always")(_add)
+    _row = njit(inline="always")(_row)
+    _inline_step = njit(inline="always")(_step)
+    step = njit(parallel=True, cache=True, boundscheck=False)(_step)
+else:
+    step = None
+
+
+def step_device(state, periodic: bool):
+    """Returns the next generation of a board held in GPU memory as a CuPy
+    array, which stays on the device. The neighbor sum over eight shifted
+    views and the B3/S23 rule are each evaluated as elementwise kernels."""
+    padded = cp.pad(state, 1, mode="wrap" if periodic else "constant")
+    nbrs = (padded[:-2, :-2] + padded[:-2, 1:-1] + padded[:-2, 2:] +
+            padded[1:-1, :-2] + padded[1:-1, 2:] +
+            padded[2:, :-2] + padded[2:, 1:-1] + padded[2:, 2:])
+    return ((nbrs == 3) | (state.astype(bool) & (nbrs == 2))).astype(cp.uint8)
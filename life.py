@@ -1,14 +1,14 @@
 # Standard Library
 import collections
-from typing import Iterator
+from typing import Callable, Iterator, List, Tuple
 
 # Third party
 import numpy as np
-from numpy.lib.stride_tricks import sliding_window_view as windows
 
 # Local
 import exceptions
 import animator
+import kernels
 import seeds
 
 # Type aliases
@@ -17,6 +17,78 @@ LifeIterator = Iterator[LifeState]
 
 # Constants
 MAX_GENERATIONS = 1000
+MAX_PERIOD = 15
+TAIL_FRAMES = 30
+GPU_MIN_SIZE = 512
+PACKED_MIN_SIZE = 600
+
+
+class NumPyStep:
+    """Advances boards with NumPy. The boards may be stacked along leading
+    axes, as they are in `LifeBatch`, since every operation indexes only the
+    last two.
+
+    The padded, column sum and neighbor buffers are reused every generation.
+    They are sized from the states themselves. One of the two padding methods
+    is bound to `pad` on construction, so that padding never has to branch
+    on the bounds."""
+    def __init__(self, periodic: bool):
+        self.pad = self.pad_periodic if periodic else self.pad_fixed
+        self.padded = self.cols = self.nbrs = None
+
+    def __call__(self, state: LifeState) -> LifeState:
+        """Calculates the next generation given the current `state` and
+        number of living neighbor `nbrs`.
+
+        A cell is alive in the next generation if it has exactly three living
+        neighbors, or if it is currently alive and has exactly two."""
+        nbrs = self.neighbors(state)
+        alive = state.view(bool)
+        return ((nbrs == 3) | (alive & (nbrs == 2))).view(np.uint8)
+
+    def neighbors(self, state: LifeState) -> LifeState:
+        """Counts the living neighbors of each cell by summing the 3x3 block
+        of the padded `state` around it, less the central cell.
+
+        The block sum is separable, so each row is first summed with the rows
+        above and below it, and then those column sums are summed across each
+        cell's left and right neighbors. This takes five additions per cell
+        instead of eight. Both sums are accumulated in place into the reused
+        buffers, so the counts are only valid until the next call."""
+        if self.nbrs is None or self.nbrs.shape != state.shape:
+            self.allocate(state.shape)
+        p, cols, nbrs = self.pad(state), self.cols, self.nbrs
+        np.add(p[..., :-2, :], p[..., 1:-1, :], out=cols)
+        np.add(cols, p[..., 2:, :], out=cols)
+        np.add(cols[..., :-2], cols[..., 1:-1], out=nbrs)
+        np.add(nbrs, cols[..., 2:], out=nbrs)
+        return np.subtract(nbrs, state, out=nbrs)
+
+    def allocate(self, shape: Tuple[int, ...]) -> None:
+        """Sizes the buffers used by `neighbors` for states of `shape`"""
+        *boards, height, width = shape
+        self.padded = np.zeros((*boards, height + 2, width + 2), np.uint8)
+        self.cols = np.empty((*boards, height, width + 2), np.uint8)
+        self.nbrs = np.empty(shape, np.uint8)
+
+    def pad_fixed(self, state: LifeState) -> LifeState:
+        """Copies `state` into the interior of the padded buffer, rather than
+        allocating a new one with `np.pad`. With fixed bounds the border is
+        always zero."""
+        p = self.padded
+        p[..., 1:-1, 1:-1] = state
+        return p
+
+    def pad_periodic(self, state: LifeState) -> LifeState:
+        """As `pad_fixed`, but with the border refreshed from the opposite
+        edges of `state`"""
+        p = self.padded
+        p[..., 1:-1, 1:-1] = state
+        p[..., 0, 1:-1], p[..., -1, 1:-1] = state[..., -1, :], state[..., 0, :]
+        p[..., 1:-1, 0], p[..., 1:-1, -1] = state[..., -1], state[..., 0]
+        p[..., 0, 0], p[..., 0, -1] = state[..., -1, -1], state[..., -1, 0]
+        p[..., -1, 0], p[..., -1, -1] = state[..., 0, -1], state[..., 0, 0]
+        return p
 
 
 class Life:
@@ -25,36 +97,43 @@ class Life:
         self.size = size
         self.bounds = bounds
         self.seed_type = seed_type
-        self.pad_mode = "constant" if self.bounds == "fixed" else "wrap"
+        self.__device = None
+        self.__packed = None
+        self.__periodic = self.bounds == "periodic"
+        self.__numpy = NumPyStep(self.__periodic)
+        self.__step = None
+        self.__advance = self.__select_update()
         self.seed = self.__seed_generator()
         self.state = self.__state_generator(next(self.seed))
-        self.history = collections.deque(maxlen=3)
+        self.history = collections.deque(maxlen=MAX_PERIOD + 1)
+        self.hashes = collections.deque(maxlen=MAX_PERIOD + 1)
         self.generations = 0
+        self.period = 0
 
     def animate(self) -> None:
         """Iterates `Life` until an exit condition is reached, then produces
         an animated gif with a filename auto-generated via `__str__()`.
 
         An `exit_code` of 2 means that either a steady state or an oscillating
-        state of period two was reached in the course of iteration. In this
-        case, the last two states are duplicated 15 extra times so that the
-        animated gif doesn't `#gifsthatendtoosoon`."""
-        frames = []
-        try:
-            while True:
-                frames.append(next(self))
-        except StopIteration as exit_code:
-            if exit_code.value == 2:
-                frames.extend(frames[-2:]*15)
-        animator.make_animation(frames, f"./examples/{self}")
+        state of period up to `MAX_PERIOD` was reached in the course of
+        iteration. In this case, the last `period` states are rendered once
+        and then looped for about `TAIL_FRAMES` extra frames so that the
+        animated gif doesn't `#gifsthatendtoosoon`.
+
+        States are streamed to the animator as they are generated rather than
+        being collected up front."""
+        animator.make_animation(self.state, f"./examples/{self}",
+                                self.__cycle, TAIL_FRAMES)
         self.reset()
 
     def reset(self) -> None:
         """Resets this object's seed and state generators"""
         self.seed = self.__seed_generator()
-        self.state = self.__state_generator()
-        self.history = collections.deque(maxlen=3)
+        self.state = self.__state_generator(next(self.seed))
+        self.history = collections.deque(maxlen=MAX_PERIOD + 1)
+        self.hashes = collections.deque(maxlen=MAX_PERIOD + 1)
         self.generations = 0
+        self.period = 0
 
     def __str__(self):
         height, width = (self.size,)*2
@@ -73,21 +152,79 @@ class Life:
     def __seed_generator(self) -> seeds.LifeSeedGenerator:
         return seeds.new_seed_generator(self.size, self.seed_type)
 
+    def __cycle(self) -> List[LifeState]:
+        """The states of the cycle which ended iteration, if there was one"""
+        if self.period == 0:
+            return []
+        return [self.__unpack(p) for p in [*self.history][-self.period:]]
+
     def __state_generator(self, state) -> LifeIterator:
+        update, check_exit = self.__advance, self.__check_exit
+        packbits = np.packbits
+        add_state, add_hash = self.history.append, self.hashes.append
+        # tiled seeds of odd `size` are a cell smaller than `size`, so the
+        # shape of the boards is taken from the seed rather than from `size`
+        self.__shape = state.shape
         while True:
             yield state
             self.generations += 1
-            self.history.append(state)
-            if (exit_code := self.__check_exit()) != 1:
+            packed = packbits(state)
+            add_state(packed)
+            add_hash(hash(packed.tobytes()))
+            if (exit_code := check_exit()) != 1:
                 return exit_code
-            state = self.__update(state)
+            state = update(state)
+
+    def __select_update(self) -> Callable[[LifeState], LifeState]:
+        """Chooses how states are advanced once, when `Life` is constructed,
+        so that the generation loop never has to branch on it.
+
+        Boards of at least `GPU_MIN_SIZE` are advanced on the GPU when CuPy is
+        available. The device copy of the latest generation is kept alongside
+        the host copy which is returned, so that each generation only needs to
+        be transferred back from the GPU, and never uploaded again.
+
+        Otherwise, boards of at least `PACKED_MIN_SIZE` are advanced by a
+        compiled kernel when Numba is available, which advances a bit-packed
+        copy of the state 64 cells at a time. The packed words of the latest
+        generation are kept alongside the unpacked state which is returned,
+        so that only the seed ever needs to be packed, and the two word
+        buffers are swapped rather than reallocated. The kernel is chosen
+        for the width of the seed when it is packed.
 
-    def __update(self, state: LifeState) -> LifeState:
-        """Calculates the next generation of `Life` given the current `state`
-        and number of living neighbor `nbrs`."""
-        adj = windows(np.pad(state, 1, self.pad_mode), (3, 3)).sum(axis=(2, 3))
-        nbrs = adj - state
-        return (nbrs < 4) * (1 - state * (nbrs % 2 - 1) + nbrs) // 4
+        Failing both, a `NumPyStep` advances the state with NumPy. Below
+        `PACKED_MIN_SIZE` it does so faster than the kernel can be loaded
+        for a run of `MAX_GENERATIONS`."""
+        if kernels.cp is not None and self.size >= GPU_MIN_SIZE:
+            return self.__update_device
+        if kernels.njit is not None and self.size >= PACKED_MIN_SIZE:
+            return self.__update_packed
+        return self.__numpy
+
+    def __update_packed(self, state: LifeState) -> LifeState:
+        if self.__packed is None or self.__packed[0] is not state:
+            words = kernels.pack(state)
+            self.__step = kernels.make_step(state.shape[1], self.__periodic)
+            self.__packed = (state, words, np.empty_like(words))
+        _, words, new_words = self.__packed
+        self.__step(words, new_words)
+        new_state = kernels.unpack(new_words, state.shape[1])
+        self.__packed = (new_state, new_words, words)
+        return new_state
+
+    def __update_device(self, state: LifeState) -> LifeState:
+        if self.__device is None or self.__device[0] is not state:
+            self.__device = (state, kernels.cp.asarray(state))
+        device_state = kernels.step_device(self.__device[1], self.__periodic)
+        new_state = kernels.cp.asnumpy(device_state)
+        self.__device = (new_state, device_state)
+        return new_state
+
+    def __unpack(self, packed: np.ndarray) -> LifeState:
+        """Restores a state stored in `history`, which keeps states packed
+        eight cells to a byte"""
+        height, width = self.__shape
+        return np.unpackbits(packed, count=height*width).reshape(height, width)
 
     def __check_exit(self) -> int:
         """
@@ -97,16 +234,118 @@ class Life:
             `0`: The maximum number of generations has been reached
             `1`: OK to continue
             `2`: A steady state has been reached
-            `2`: An oscillating state of period two has been reached
+            `2`: An oscillating state of period up to `MAX_PERIOD` has been
+                 reached, with the period recorded in `self.period`
+
+        The latest state is compared against each of the previous `MAX_PERIOD`
+        states by their hashes first, so that a full comparison of the boards
+        is only needed to rule out a hash collision.
         """
         exit_code = 1
-        if len(self.history) > 2:
-            if np.array_equal(self.history[-2], self.history[-1]):
-                print("steady state reached")
-                exit_code = 2
-            elif np.array_equal(self.history[-3], self.history[-1]):
-                print("oscillating state period two reached")
+        history, hashes = self.history, self.hashes
+        for period in range(1, len(hashes)):
+            if (hashes[-1 - period] == hashes[-1] and
+                    np.array_equal(history[-1 - period], history[-1])):
+                if period == 1:
+                    print("steady state reached")
+                elif period == 2:
+                    print("oscillating state period two reached")
+                else:
+                    print(f"oscillating state period {period} reached")
+                self.period = period
                 exit_code = 2
+                break
+        if self.generations == MAX_GENERATIONS:
+            print("reached maximum allowed generations")
+            exit_code = 0
+        return exit_code
+
+
+class LifeBatch:
+    """Iterates `batch` independent boards of the same size, bounds and seed
+    type together, stacked along a leading axis. Each generation of the whole
+    stack takes the same handful of NumPy calls as a single board does, so
+    the per-call overhead which dominates small boards is shared by all of
+    them.
+
+    Iterating yields the stacked states, with the boards along the first
+    axis, which are advanced by the same `NumPyStep` as in `Life`.
+    Each board keeps being advanced after it settles into a steady or
+    oscillating state, whose period is recorded in `periods`, and iteration
+    ends once every board has done so."""
+    def __init__(self, batch=32, size=100, bounds="fixed", seed_type="tiles"):
+        exceptions.validate_args(size, bounds, seed_type)
+        exceptions.validate_batch(batch)
+        self.batch = batch
+        self.size = size
+        self.bounds = bounds
+        self.seed_type = seed_type
+        self.__numpy = NumPyStep(bounds == "periodic")
+        self.reset()
+
+    def reset(self) -> None:
+        """Resets this object's seed and state generators"""
+        self.seed = seeds.new_seed_generator(self.size, self.seed_type)
+        self.state = self.__state_generator(self.__seeds())
+        self.history = collections.deque(maxlen=MAX_PERIOD + 1)
+        self.generations = 0
+        self.periods = np.zeros(self.batch, dtype=int)
+
+    def __str__(self):
+        height, width = (self.size,)*2
+        return f"{self.batch}x{width}x{height}_{self.bounds}_{self.seed_type}"
+
+    def __repr__(self):
+        batch, size, bounds = self.batch, self.size, self.bounds
+        seed_type = self.seed_type
+        return f"LifeBatch({batch=}, {size=}, {bounds=}, {seed_type=})"
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self.state)
+
+    def __seeds(self) -> LifeState:
+        return np.stack([next(self.seed) for _ in range(self.batch)])
+
+    def __state_generator(self, states) -> LifeIterator:
+        update, check_exit = self.__numpy, self.__check_exit
+        packbits, add_states = np.packbits, self.history.append
+        while True:
+            yield states
+            self.generations += 1
+            add_states(packbits(states.reshape(self.batch, -1), axis=1))
+            if (exit_code := check_exit()) != 1:
+                return exit_code
+            states = update(states)
+
+    def __check_exit(self) -> int:
+        """
+        Checks for the same exit conditions as `Life`, over every board.
+
+        Exit codes:
+            `0`: The maximum number of generations has been reached
+            `1`: OK to continue
+            `2`: Every board has reached a steady state or an oscillating
+                 state of period up to `MAX_PERIOD`, with the periods
+                 recorded in `self.periods`
+
+        Boards which are still running are compared against each of their
+        previous `MAX_PERIOD` states, shortest period first, so that each
+        board is given the smallest period it repeats with.
+        """
+        exit_code = 1
+        history, periods = self.history, self.periods
+        for period in range(1, len(history)):
+            running = periods == 0
+            if not running.any():
+                break
+            same = (history[-1 - period] == history[-1]).all(axis=1)
+            periods[running & same] = period
+        if periods.all():
+            print(f"steady or oscillating states reached on all {self.batch}")
+            exit_code = 2
         if self.generations == MAX_GENERATIONS:
             print("reached maximum allowed generations")
             exit_code = 0
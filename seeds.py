@@ -1,6 +1,8 @@
 # Standard Library
+import functools
+import math
 import random
-from typing import Iterator, Tuple
+from typing import Iterator, List, Tuple
 
 # Third party
 import numpy as np
@@ -11,6 +13,9 @@ LifeSeed = np.ndarray
 ArrayShape = Tuple[int, int]
 LifeSeedGenerator = Iterator[LifeSeed]
 
+# Shared bit generator, which is faster than the legacy global `np.random`
+rng = np.random.default_rng()
+
 
 class TileMaker:
     """Static methods for generating random binary tiles"""
@@ -25,25 +30,51 @@ class TileMaker:
 
     @staticmethod
     def noise(shape: ArrayShape) -> Tile:
-        """Binary noise tile, the base working unit for the other methods"""
-        return np.random.randint(2, size=shape, dtype="uint8")
+        """
+        Binary noise tile, the base working unit for the other methods.
+
+        Rather than drawing a whole random byte per cell, random bytes are
+        drawn for eight cells at a time and unpacked into their bits.
+        """
+        height, width = shape
+        raw = rng.integers(256, size=(height, -(-width // 8)), dtype="uint8")
+        return np.unpackbits(raw, axis=1, count=width)
 
     @staticmethod
     def quilt(shape: ArrayShape) -> Tile:
-        """A base triangular array"""
-        return np.triu(TileMaker.noise(shape))
+        """
+        A base triangular array.
+
+        Only the cells of the upper triangle are drawn, and scattered through
+        the cached `upper_mask`, instead of drawing a full noise tile and
+        zeroing the half of it which lies below the diagonal.
+        """
+        mask = TileMaker.upper_mask(shape)
+        count = shape[0]*(shape[0] + 1)//2
+        raw = rng.integers(256, size=-(-count // 8), dtype="uint8")
+        tri = np.zeros(shape, dtype="uint8")
+        tri[mask] = np.unpackbits(raw, count=count)
+        return tri
 
     @staticmethod
     def diagonal(shape: ArrayShape) -> Tile:
         """Diagonally symmetric array"""
         tri = TileMaker.quilt(shape)
-        return np.clip(tri + tri.T, 0, 1)
+        return tri | tri.T
 
     @staticmethod
     def inverted_diagonal(shape: ArrayShape) -> Tile:
         """Diagonally symmetric array with flipped bits in lower triangular"""
         tri = TileMaker.quilt(shape)
-        return np.triu(np.where(tri, 0, 1)).T + tri
+        return (TileMaker.upper_mask(shape) & (tri == 0)).T.view("uint8") | tri
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def upper_mask(shape: ArrayShape) -> np.ndarray:
+        """Read-only boolean mask of the upper triangle, cached per shape"""
+        mask = np.triu(np.ones(shape, dtype=bool))
+        mask.flags.writeable = False
+        return mask
 
 
 class TilePattern:
@@ -54,7 +85,8 @@ class TilePattern:
                                        TilePattern.book_match,
                                        TilePattern.hamburger,
                                        TilePattern.repeat))
-        return np.tile(tiling_method(array), (pattern_number,)*2)
+        seed = np.tile(tiling_method(array), (pattern_number,)*2)
+        return np.ascontiguousarray(seed)
 
     @staticmethod
     def four_corners(NW: Tile) -> LifeSeed:
@@ -70,7 +102,7 @@ class TilePattern:
         NE = np.fliplr(NW)
         SW = np.flipud(NW)
         SE = np.flipud(NE)
-        return np.block([[NW, NE], [SW, SE]])
+        return TilePattern.quadrants(NW, NE, SW, SE)
 
     @staticmethod
     def book_match(L: Tile) -> LifeSeed:
@@ -84,7 +116,7 @@ class TilePattern:
         ```
         """
         R = np.fliplr(L)
-        return np.block([[L, R], [L, R]])
+        return TilePattern.quadrants(L, R, L, R)
 
     @staticmethod
     def hamburger(T: Tile) -> LifeSeed:
@@ -98,7 +130,7 @@ class TilePattern:
         ```
         """
         B = np.flipud(T)
-        return np.block([[T, T], [B, B]])
+        return TilePattern.quadrants(T, T, B, B)
 
     @staticmethod
     def repeat(x: Tile) -> LifeSeed:
@@ -111,6 +143,20 @@ class TilePattern:
         """
         return np.tile(x, (2, 2))
 
+    @staticmethod
+    def quadrants(NW: Tile, NE: Tile, SW: Tile, SE: Tile) -> LifeSeed:
+        """
+        Writes four tiles of the same shape into the quadrants of a single
+        preallocated array, which is equivalent to, but cheaper than,
+        `np.block([[NW, NE], [SW, SE]])`. The flipped tiles passed in are
+        views, so the output is the only array that gets allocated.
+        """
+        h, w = NW.shape
+        seed = np.empty((2*h, 2*w), dtype=NW.dtype)
+        seed[:h, :w], seed[:h, w:] = NW, NE
+        seed[h:, :w], seed[h:, w:] = SW, SE
+        return seed
+
 
 class SeedGenerators:
     @staticmethod
@@ -134,12 +180,26 @@ class SeedGenerators:
         After the dust settles, the final seed is of the correct shape.
         """
         k = n // 2
+        d = SeedGenerators.divisor_pairs(k)
+        tile_maker, tile_pattern = TileMaker(), TilePattern()
         while True:
-            tile_maker, tile_pattern = TileMaker(), TilePattern()
-            d = [(x, k // x) for x in range(2, k + 1) if k % x == 0]
-            num_tiles, tile_size = sorted(random.choice(d))
+            num_tiles, tile_size = random.choice(d)
             yield tile_pattern(tile_maker(tile_size), num_tiles)
 
+    @staticmethod
+    def divisor_pairs(k: int) -> List[Tuple[int, int]]:
+        """
+        Sorted pairs of divisors of `k` whose product is `k`, found by trial
+        division up to the square root of `k`.
+
+        Pairs of two distinct divisors greater than one are listed twice,
+        since both of their divisors produce them, which keeps the odds of
+        drawing each pair the same as a full trial division over `2..k`.
+        """
+        root = math.isqrt(k)
+        pairs = [(x, k // x) for x in range(1, root + 1) if k % x == 0]
+        return [p for p in pairs for _ in range(1 + (1 < p[0] < p[1]))]
+
     @staticmethod
     def noisy(n: int) -> LifeSeedGenerator:
         """Yields uniformly noisy binary arrays"""
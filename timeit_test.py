@@ -4,39 +4,21 @@ import timeit
 import numpy as np
 from numpy.lib.stride_tricks import sliding_window_view as window
 
+import kernels
+from life import NumPyStep
 
-# SHAPE = (100, 100)
-# RULES = {(1, 2): 1, (1, 3): 1, (0, 3): 1}
-# NEXT_STATE = np.vectorize(lambda x, y: RULES.get((x, y), 0))
 
+def arithmetic_state(s, n):
+    return (n < 4) * (1 - s * (n % 2 - 1) + n) // 4
 
-# c = np.random.randint(0, 2, SHAPE, dtype="uint8")
-# n = np.random.randint(0, 9, SHAPE, dtype="uint8")
 
+def bool_state(s, n):
+    return ((n == 3) | (s.astype(bool) & (n == 2))).view(np.uint8)
 
-# def next_state(s, n):
-#     return (n < 4) * (1 - s * (n % 2 - 1) + n) // 4
 
-
-# t1 = timeit.timeit(
-#     "NEXT_STATE(c, n)",
-#     number=1000,
-#     globals=globals()
-# )
-
-# t2 = timeit.timeit(
-#     "next_state(c, n)",
-#     number=1000,
-#     globals=globals()
-# )
-
-# print(f"vectorized dict: {t1:.2f} s")
-# print(f"formula: {t2:.2f} s")
-
-
-# c = np.random.randint(0, 2, SHAPE, dtype="uint8")
-# n = np.random.randint(0, 9, SHAPE, dtype="uint8")
-# print(np.array_equal(NEXT_STATE(c, n), next_state(c, n)))
+# every (cell, neighbors) pair: s in {0, 1}, n in 0..8
+all_s, all_n = np.meshgrid(np.arange(2), np.arange(9))
+print(np.array_equal(arithmetic_state(all_s, all_n), bool_state(all_s, all_n)))
 
 
 class PadTest:
@@ -63,7 +45,7 @@ class PadTest:
     def run(self):
         for _ in range(1000):
             n = window(self.pad, (3, 3)).sum(axis=(2, 3)) - self.x
-            self.x = (n < 4) * (1 - self.x * (n % 2 - 1) + n) // 4
+            self.x = bool_state(self.x, n)
 
 
 x = np.random.randint(2, size=(100, 100), dtype="uint8")
@@ -89,3 +71,58 @@ print(f"zero: {t1:.4f} s")
 print(f"wrap: {t2:.4f} s")
 print(f"np.pad zero: {t3:.4f} s")
 print(f"np.pad wrap: {t4:.4f} s")
+
+
+LUT = np.zeros(32, dtype="uint8")
+LUT[(1 << 4) | 2] = LUT[(1 << 4) | 3] = LUT[(0 << 4) | 3] = 1
+
+
+def lut_state(s, n):
+    return LUT[(s << 4) | n]
+
+
+RULE_TABLE = np.array([[0, 0, 0, 1, 0, 0, 0, 0, 0],
+                       [0, 0, 1, 1, 0, 0, 0, 0, 0]], dtype="uint8")
+
+
+def table_state(s, n):
+    return RULE_TABLE[s, n]
+
+
+s = np.random.randint(2, size=(100, 100), dtype="uint8")
+n = np.random.randint(9, size=(100, 100), dtype="uint8")
+print(np.array_equal(lut_state(s, n), bool_state(s, n)))
+print(np.array_equal(table_state(s, n), bool_state(s, n)))
+
+t5 = timeit.timeit("lut_state(s, n)", number=1000, globals=globals())
+t6 = timeit.timeit("bool_state(s, n)", number=1000, globals=globals())
+t7 = timeit.timeit("table_state(s, n)", number=1000, globals=globals())
+
+print(f"lookup table: {t5:.4f} s")
+print(f"boolean: {t6:.4f} s")
+print(f"rule table: {t7:.4f} s")
+
+
+def packed_state(s, periodic, generations=10):
+    """Advances `s` with the packed kernel, checking every generation
+    against `NumPyStep`"""
+    height, width = s.shape
+    step, reference = kernels.make_step(width, periodic), NumPyStep(periodic)
+    words = kernels.pack(s)
+    out = np.empty_like(words)
+    for _ in range(generations):
+        step(words, out)
+        s = reference(s).copy()
+        if not np.array_equal(kernels.unpack(out, width), s):
+            return False
+        words, out = out, words
+    return True
+
+
+# widths either side of a word boundary, and past the specialized width
+if kernels.make_step(64, False) is not None:
+    for periodic in (False, True):
+        shapes = [(w, w) for w in (63, 64, 65, 129)]
+        shapes.append((8, kernels.SPECIALIZE_MIN_WIDTH + 1))
+        print(all(packed_state(np.random.randint(2, size=shape, dtype="uint8"),
+                               periodic) for shape in shapes))